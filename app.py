@@ -1,26 +1,39 @@
 from __future__ import annotations
 
+import os
 from datetime import date
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 
-import pandas as pd
-import streamlit as st
-from dotenv import load_dotenv
+from utils import timing
 
-import database as db
-from ui.dashboard import render_dashboard
-from ui.expense_page import render_expense_page
-from ui.income_page import render_income_page
-from ui.upload_page import render_upload_page
-from utils import ai_insights
+# Only the first run in a process pays for these; reruns find the modules already imported.
+with timing.timed("import app modules", once=True):
+    import pandas as pd
+    import streamlit as st
+    from dotenv import load_dotenv
 
+    import database as db
+    from ui.dashboard import render_dashboard
+    from ui.expense_page import render_expense_page
+    from ui.income_page import render_income_page
+    from ui.upload_page import render_upload_page
+    from utils import ai_insights
 
-load_dotenv()
-db.init_db()
 
 st.set_page_config(page_title="Sempreviva Dashboard", layout="wide")
 
 
+@st.cache_resource(show_spinner=False)
+def _bootstrap() -> None:
+    # Runs once per server process instead of on every Streamlit rerun.
+    with timing.timed("bootstrap", once=True):
+        load_dotenv()
+        db.init_db()
+
+
+_bootstrap()
+
+
 @st.cache_data
 def _get_date_defaults() -> Tuple[date, date]:
     min_date_str, max_date_str = db.get_date_bounds()
@@ -56,6 +69,7 @@ def _load_datasets(start: str, end: str):
     income_category_breakdown = db.get_breakdown("INCOME", "category", start, end)
     expense_category_breakdown = db.get_breakdown("EXPENSE", "category", start, end)
     expense_group_breakdown = db.get_breakdown("EXPENSE", "subcategory", start, end)
+    anomalies = db.get_anomalies(start, end)
 
     return {
         "transactions": transactions,
@@ -67,17 +81,48 @@ def _load_datasets(start: str, end: str):
         "income_category_breakdown": income_category_breakdown,
         "expense_category_breakdown": expense_category_breakdown,
         "expense_group_breakdown": expense_group_breakdown,
+        "anomalies": anomalies,
     }
 
 
+class _NoInsights(Exception):
+    pass
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_insights(stats: Dict[str, Any]) -> str:
+    text = ai_insights.generate_insights(stats)
+    # st.cache_data does not cache exceptions, so a failed or skipped call is retried on the next rerun.
+    if text is None:
+        raise _NoInsights
+    return text
+
+
+def _insights(stats: Dict[str, Any]) -> Optional[str]:
+    try:
+        return _cached_insights(stats)
+    except _NoInsights:
+        return None
+
+
+def _timing_report() -> None:
+    if not os.getenv("SEMPREVIVA_TIMINGS"):
+        return
+    with st.sidebar.expander("Tiempos de carga"):
+        for line in timing.report():
+            st.caption(line)
+
+
 def main():
+    timing.reset()
     st.sidebar.title("Sempreviva")
     st.sidebar.markdown("Navegación")
     start, end = _date_range_selector()
 
     page = st.sidebar.radio("", ["Dashboard", "Ingresos", "Gastos", "Subir archivo"])
 
-    data = _load_datasets(start, end)
+    with timing.timed("load datasets"):
+        data = _load_datasets(start, end)
 
     insight_text = None
     if not data["transactions"].empty:
@@ -87,8 +132,15 @@ def main():
             "top_income": data["income_category_breakdown"].head(3).to_dict("records"),
             "top_expenses": data["expense_category_breakdown"].head(3).to_dict("records"),
         }
-        insight_text = ai_insights.generate_insights(stats)
+        with timing.timed("ai insights"):
+            insight_text = _insights(stats)
+
+    with timing.timed("render page"):
+        _render_page(page, data, insight_text)
+    _timing_report()
+
 
+def _render_page(page: str, data: Dict[str, Any], insight_text: Optional[str]) -> None:
     if page == "Dashboard":
         render_dashboard(
             data["totals"],
@@ -96,6 +148,7 @@ def main():
             data["income_channel_breakdown"],
             data["expense_category_breakdown"],
             ai_text=insight_text,
+            anomalies_df=data["anomalies"],
         )
     elif page == "Ingresos":
         render_income_page(
@@ -1,19 +1,70 @@
 from __future__ import annotations
 
+import os
+import shutil
 import sqlite3
+import time
+from collections import defaultdict
 from contextlib import contextmanager
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+from processing import anomalies
+
 DB_PATH = Path("sempreviva.db")
+ARCHIVE_DIR = Path("archive")
+
+# Set to 1 to store transactions in one SQLite file per year (sempreviva_<year>.db).
+PARTITION_ENV = "SEMPREVIVA_PARTITION_BY_YEAR"
+
+# SQLite's default compile-time limit on attached databases.
+_MAX_ATTACHED = 10
+
+_TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {schema}transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        amount REAL NOT NULL,
+        type TEXT NOT NULL CHECK(type IN ('INCOME', 'EXPENSE')),
+        category TEXT,
+        subcategory TEXT,
+        description TEXT,
+        source_file TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Serves date-range queries and the exact (date, amount) lookups of the duplicate check.
+_TRANSACTIONS_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS {schema}idx_transactions_date_amount ON transactions(date, amount)"
+)
+
+_TRANSACTION_FIELDS = ("date", "amount", "type", "category", "subcategory", "description", "source_file", "created_at")
+_TRANSACTION_COLUMNS = ", ".join(_TRANSACTION_FIELDS)
+
+# Positional parameters bind noticeably faster than named ones looked up in each row dict.
+_INSERT_TRANSACTION = (
+    "INSERT INTO {schema}transactions (" + _TRANSACTION_COLUMNS + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_row_values = itemgetter(*_TRANSACTION_FIELDS)
+
+# Bulk loads insert in chunks of this many rows. Loads of at least BULK_RELAX_THRESHOLD rows run with
+# synchronous=OFF, and a table receiving at least BULK_DEFER_THRESHOLD rows, and no fewer than it already
+# holds, has its (date, amount) index dropped and rebuilt once at the end.
+BULK_BATCH_SIZE = 50_000
+BULK_RELAX_THRESHOLD = 100_000
+BULK_DEFER_THRESHOLD = 200_000
+
+_FRAME_COLUMNS = ["date", "amount", "type", "category", "description", "source_file"]
 
 
 @contextmanager
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+def get_connection(path: Optional[Path] = None):
+    conn = sqlite3.connect(path or DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -21,49 +72,316 @@ def get_connection():
         conn.close()
 
 
-def init_db() -> None:
-    DB_PATH.touch(exist_ok=True)
-    with get_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                type TEXT NOT NULL CHECK(type IN ('INCOME', 'EXPENSE')),
-                category TEXT,
-                subcategory TEXT,
-                description TEXT,
-                source_file TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-            """
+def partitioning_enabled() -> bool:
+    return os.getenv(PARTITION_ENV, "").strip().lower() in {"1", "true", "yes"}
+
+
+def partition_path(year: int) -> Path:
+    return DB_PATH.with_name(f"{DB_PATH.stem}_{year}{DB_PATH.suffix}")
+
+
+def list_partitions() -> List[int]:
+    prefix = f"{DB_PATH.stem}_"
+    years = []
+    for path in DB_PATH.parent.glob(f"{prefix}*{DB_PATH.suffix}"):
+        suffix = path.stem[len(prefix):]
+        if len(suffix) == 4 and suffix.isdigit():
+            years.append(int(suffix))
+    return sorted(years)
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    conn.execute(_TRANSACTIONS_DDL.format(schema=""))
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS processed_files (
+            filename TEXT PRIMARY KEY,
+            upload_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            row_count INTEGER NOT NULL
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS processed_files (
-                filename TEXT PRIMARY KEY,
-                upload_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                row_count INTEGER NOT NULL
-            )
-            """
+        """
+    )
+
+
+def _migrate_v2(conn: sqlite3.Connection) -> None:
+    conn.execute(_TRANSACTIONS_INDEX_DDL.format(schema=""))
+
+
+def _migrate_v3(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS category_stats (
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            mean REAL NOT NULL,
+            m2 REAL NOT NULL,
+            PRIMARY KEY (type, category)
         )
-        conn.commit()
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS anomalies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            amount REAL NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT,
+            description TEXT,
+            source_file TEXT,
+            reason TEXT NOT NULL,
+            score REAL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_anomalies_date ON anomalies(date)")
+    frames = _read_frames("SELECT type, category, amount FROM transactions", [], None, None)
+    _write_category_stats(conn, anomalies.batch_stats(pd.concat(frames, ignore_index=True)))
+
+
+# Each entry upgrades the schema by one version; PRAGMA user_version stores the current one.
+_MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3]
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+_initialized = False
+
+
+def use_database(path: Path) -> None:
+    # Points the module at another database file (tools, tests); the next init_db() sets it up.
+    global DB_PATH, _initialized
+    DB_PATH = Path(path)
+    _initialized = False
+
+
+def init_db() -> None:
+    global _initialized
+    if _initialized:
+        return
+
+    with get_connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            for migrate in _MIGRATIONS[version:]:
+                migrate(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+    if partitioning_enabled():
+        migrate_to_partitions()
+    _initialized = True
+
+
+def _attach_partition(conn: sqlite3.Connection, year: int) -> str:
+    schema = f"p{year}"
+    attached = {row["name"] for row in conn.execute("PRAGMA database_list")}
+    if schema not in attached:
+        conn.execute("ATTACH DATABASE ? AS " + schema, (str(partition_path(year)),))
+    # Always re-checked: another process may have archived the partition, leaving a fresh empty file.
+    conn.execute(_TRANSACTIONS_DDL.format(schema=f"{schema}."))
+    conn.execute(_TRANSACTIONS_INDEX_DDL.format(schema=f"{schema}."))
+    return schema
+
+
+def _detach_partitions(conn: sqlite3.Connection) -> None:
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row["name"] not in {"main", "temp"}:
+            conn.execute("DETACH DATABASE " + row["name"])
+
+
+def _date_year(value) -> Optional[int]:
+    # Blank Excel dates arrive as "NaT"; anything without a leading four-digit year has no partition.
+    prefix = str(value)[:4]
+    return int(prefix) if len(prefix) == 4 and prefix.isdigit() else None
+
+
+def _row_year(row: Dict) -> Optional[int]:
+    return _date_year(row["date"])
+
+
+def _target_groups(rows: List[Dict]) -> List[Dict[Optional[int], List[Dict]]]:
+    # Rows keyed by partition year (None is the main table), in groups small enough to attach at once.
+    if not partitioning_enabled():
+        return [{None: rows}]
+
+    by_year: Dict[Optional[int], List[Dict]] = defaultdict(list)
+    for row in rows:
+        by_year[_row_year(row)].append(row)
+    undated = by_year.pop(None, [])
+    years = sorted(by_year)
+    groups = [
+        {year: by_year[year] for year in years[offset:offset + _MAX_ATTACHED]}
+        for offset in range(0, len(years), _MAX_ATTACHED)
+    ] or [{}]
+    # Rows without a usable year stay in the main table.
+    if undated:
+        groups[-1][None] = undated
+    return groups
+
+
+def _attach_targets(conn: sqlite3.Connection, group: Dict[Optional[int], List[Dict]]) -> Dict[str, List[Dict]]:
+    # ATTACH is not allowed inside a transaction, so this runs before BEGIN.
+    return {("main" if year is None else _attach_partition(conn, year)): rows for year, rows in group.items()}
+
+
+def migrate_to_partitions() -> int:
+    if not partitioning_enabled():
+        # Rows would be written back into main.transactions and then deleted along with the originals.
+        raise RuntimeError(f"Set {PARTITION_ENV}=1 before moving transactions into year partitions.")
+
+    dated = "substr(date, 1, 4) GLOB '[0-9][0-9][0-9][0-9]'"
+    moved = 0
+    with get_connection() as conn:
+        while True:
+            years = [
+                int(row[0])
+                for row in conn.execute(
+                    f"SELECT DISTINCT substr(date, 1, 4) FROM main.transactions WHERE {dated} ORDER BY 1 LIMIT ?",
+                    (_MAX_ATTACHED,),
+                )
+            ]
+            if not years:
+                return moved
+            schemas = {year: _attach_partition(conn, year) for year in years}
+            # Copy and delete share one write transaction, so two processes starting at once cannot both
+            # copy the same rows.
+            conn.execute("BEGIN IMMEDIATE")
+            for year, schema in schemas.items():
+                moved += conn.execute(
+                    f"INSERT INTO {schema}.transactions ({_TRANSACTION_COLUMNS}) "
+                    f"SELECT {_TRANSACTION_COLUMNS} FROM main.transactions WHERE substr(date, 1, 4) = ? ORDER BY id",
+                    (f"{year:04d}",),
+                ).rowcount
+                conn.execute("DELETE FROM main.transactions WHERE substr(date, 1, 4) = ?", (f"{year:04d}",))
+            conn.commit()
+            _detach_partitions(conn)
+
+
+def _upsert_processed_file(conn: sqlite3.Connection, filename: str, row_count: int) -> None:
+    conn.execute(
+        """
+        INSERT INTO processed_files (filename, upload_date, row_count)
+        VALUES (?, ?, ?)
+        ON CONFLICT(filename) DO UPDATE SET
+            upload_date=excluded.upload_date,
+            row_count=excluded.row_count
+        """,
+        (filename, datetime.utcnow().isoformat(), row_count),
+    )
 
 
 def record_processed_file(filename: str, row_count: int) -> None:
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO processed_files (filename, upload_date, row_count)
-            VALUES (?, ?, ?)
-            ON CONFLICT(filename) DO UPDATE SET
-                upload_date=excluded.upload_date,
-                row_count=excluded.row_count
+        _upsert_processed_file(conn, filename, row_count)
+        conn.commit()
+
+
+def _write_category_stats(conn: sqlite3.Connection, stats: pd.DataFrame) -> None:
+    conn.executemany(
+        """
+        INSERT INTO category_stats (type, category, count, mean, m2)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(type, category) DO UPDATE SET
+            count=excluded.count,
+            mean=excluded.mean,
+            m2=excluded.m2
+        """,
+        [
+            (row.type, row.category, int(row.count), float(row.mean), float(row.m2))
+            for row in stats.itertuples(index=False)
+        ],
+    )
+
+
+def _match_duplicates(conn: sqlite3.Connection, keys: pd.DataFrame, schemas: Iterable[str]) -> List[pd.DataFrame]:
+    # CROSS JOIN keeps the candidate keys as the outer loop, so each key is one (date, amount) index
+    # seek and the cost follows the batch size rather than the history stored for those dates.
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS duplicate_keys (date TEXT, amount REAL, description TEXT)")
+    conn.execute("DELETE FROM temp.duplicate_keys")
+    conn.executemany(
+        "INSERT INTO temp.duplicate_keys VALUES (?, ?, ?)",
+        zip(keys["date"].tolist(), keys["amount"].tolist(), keys["description"].tolist()),
+    )
+    return [
+        pd.read_sql_query(
+            f"""
+            SELECT t.date, t.type, t.amount, t.description
+            FROM temp.duplicate_keys AS k
+            CROSS JOIN {schema}.transactions AS t
+                ON t.date = k.date AND t.amount = k.amount AND t.description = k.description
+            WHERE t.type = 'EXPENSE'
             """,
-            (filename, datetime.utcnow().isoformat(), row_count),
+            conn,
         )
-        conn.commit()
+        for schema in schemas
+    ]
+
+
+def _duplicate_candidates(batch: pd.DataFrame, conn: sqlite3.Connection, schemas: Iterable[str]) -> pd.DataFrame:
+    expenses = batch[batch["type"] == "EXPENSE"]
+    dates = expenses["date"].astype(str)
+    description = expenses["description"].fillna("").astype(str).str.strip()
+    keys = expenses.loc[dates.str.match(r"\d{4}") & (description != ""), ["date", "amount", "description"]]
+    if keys.empty:
+        return pd.DataFrame(columns=anomalies.DUPLICATE_KEYS)
+    keys = keys.drop_duplicates().astype({"date": str, "amount": float, "description": str})
+    return pd.concat(_match_duplicates(conn, keys, schemas), ignore_index=True)
+
+
+def _update_anomaly_state(conn: sqlite3.Connection, batch: pd.DataFrame, history: pd.DataFrame) -> None:
+    # Must run in the same BEGIN IMMEDIATE transaction as the duplicate lookup and the inserts: a concurrent
+    # upload then either committed before the lookup (and is seen) or waits until this one commits.
+    prior = pd.read_sql_query("SELECT type, category, count, mean, m2 FROM category_stats", conn)
+    flagged = anomalies.flag_anomalies(batch, prior, history)
+    _write_category_stats(conn, anomalies.merge_stats(prior, anomalies.batch_stats(batch)))
+    if flagged.empty:
+        return
+    conn.executemany(
+        """
+        INSERT INTO anomalies (date, amount, type, category, description, source_file, reason, score)
+        VALUES (:date, :amount, :type, :category, :description, :source_file, :reason, :score)
+        """,
+        flagged.astype(object).where(flagged.notna(), None).to_dict("records"),
+    )
+
+
+def _rows_frame(values: List[Tuple]) -> pd.DataFrame:
+    # Only the columns anomaly detection needs, built from the already extracted insert tuples.
+    return pd.DataFrame(values, columns=_TRANSACTION_FIELDS)[_FRAME_COLUMNS]
+
+
+def _rebuild_index(conn: sqlite3.Connection, schema: str, new_rows: int, defer: Optional[bool]) -> bool:
+    if defer is not None:
+        return defer
+    if new_rows < BULK_DEFER_THRESHOLD:
+        return False
+    # Rebuilding re-sorts the whole table, so it only beats per-row index updates when the load is at least as
+    # large as what is already stored. max(rowid) is an O(1) upper bound on that.
+    stored = conn.execute(f"SELECT max(rowid) FROM {schema}.transactions").fetchone()[0] or 0
+    return new_rows >= stored
+
+
+def _store_rows(
+    conn: sqlite3.Connection,
+    values: Dict[str, List[Tuple]],
+    batch_size: int = BULK_BATCH_SIZE,
+    rebuild: Iterable[str] = (),
+) -> None:
+    batch = _rows_frame([row for schema_values in values.values() for row in schema_values])
+    if batch.empty:
+        return
+    # The duplicate lookup needs the (date, amount) index, so it runs before any index is dropped; scoring
+    # and stats then run once for the whole load, leaving only executemany in the insert loop.
+    history = _duplicate_candidates(batch, conn, values)
+    for schema in rebuild:
+        conn.execute(f"DROP INDEX IF EXISTS {schema}.idx_transactions_date_amount")
+    for schema, schema_values in values.items():
+        insert = _INSERT_TRANSACTION.format(schema=f"{schema}.")
+        for offset in range(0, len(schema_values), batch_size):
+            conn.executemany(insert, schema_values[offset:offset + batch_size])
+    for schema in rebuild:
+        conn.execute(_TRANSACTIONS_INDEX_DDL.format(schema=f"{schema}."))
+    _update_anomaly_state(conn, batch, history)
 
 
 def insert_transactions(rows: Iterable[Dict]) -> int:
@@ -72,19 +390,75 @@ def insert_transactions(rows: Iterable[Dict]) -> int:
         return 0
 
     with get_connection() as conn:
-        conn.executemany(
-            """
-            INSERT INTO transactions (
-                date, amount, type, category, subcategory, description, source_file, created_at
-            )
-            VALUES (:date, :amount, :type, :category, :subcategory, :description, :source_file, :created_at)
-            """,
-            rows,
-        )
-        conn.commit()
+        # Loads spanning more years than SQLite can attach at once commit one group of years at a time.
+        for group in _target_groups(rows):
+            targets = _attach_targets(conn, group)
+            conn.execute("BEGIN IMMEDIATE")
+            _store_rows(conn, {schema: list(map(_row_values, target_rows)) for schema, target_rows in targets.items()})
+            conn.commit()
+            _detach_partitions(conn)
     return len(rows)
 
 
+def _load_result(rows: int, began: float) -> Dict[str, float]:
+    elapsed = time.perf_counter() - began
+    return {"rows": rows, "seconds": elapsed, "rows_per_s": rows / elapsed if elapsed else 0.0}
+
+
+def bulk_load_transactions(
+    rows: Iterable[Dict],
+    filename: str,
+    defer_maintenance: Optional[bool] = None,
+    relax_durability: Optional[bool] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Dict[str, float]:
+    began = time.perf_counter()
+    rows = list(rows)
+    groups = _target_groups(rows)
+    if not rows or len(groups) > 1:
+        # Empty files are still recorded; loads spanning more years than SQLite can attach at once fall
+        # back to the chunked insert, which commits one group of years at a time.
+        inserted = insert_transactions(rows)
+        record_processed_file(filename, inserted)
+        return _load_result(inserted, began)
+
+    if relax_durability is None:
+        relax_durability = len(rows) >= BULK_RELAX_THRESHOLD
+
+    with get_connection() as conn:
+        previous_sync: Dict[str, int] = {}
+        try:
+            targets = _attach_targets(conn, groups[0])
+            if relax_durability:
+                # synchronous and cache_size are per schema and per connection, so each attached
+                # partition is relaxed too and other sessions are unaffected.
+                for schema in {"main", *targets}:
+                    previous_sync[schema] = conn.execute(f"PRAGMA {schema}.synchronous").fetchone()[0]
+                    conn.execute(f"PRAGMA {schema}.synchronous = OFF")
+                    conn.execute(f"PRAGMA {schema}.cache_size = -65536")
+                conn.execute("PRAGMA temp_store = MEMORY")
+            values = {schema: list(map(_row_values, target_rows)) for schema, target_rows in targets.items()}
+            # Partitions are attached above because ATTACH is not allowed once the transaction starts;
+            # everything below, including the processed_files record, commits or rolls back together.
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild = [
+                schema
+                for schema, schema_values in values.items()
+                if _rebuild_index(conn, schema, len(schema_values), defer_maintenance)
+            ]
+            _store_rows(conn, values, batch_size, rebuild)
+            _upsert_processed_file(conn, filename, len(rows))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            for schema, level in previous_sync.items():
+                conn.execute(f"PRAGMA {schema}.synchronous = {level}")
+
+    return _load_result(len(rows), began)
+
+
 def _date_filters(start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, List[str]]:
     clauses: List[str] = []
     params: List[str] = []
@@ -98,6 +472,34 @@ def _date_filters(start_date: Optional[str], end_date: Optional[str]) -> Tuple[s
     return where, params
 
 
+def _sources(start_date: Optional[str], end_date: Optional[str]) -> List[Path]:
+    if not partitioning_enabled():
+        return [DB_PATH]
+
+    start_year = _date_year(start_date) if start_date else None
+    end_year = _date_year(end_date) if end_date else None
+    paths = [
+        partition_path(year)
+        for year in list_partitions()
+        if (start_year is None or year >= start_year) and (end_year is None or year <= end_year)
+    ]
+    # Undated rows ("NaT") stay in the main table and sort after every year, so open-ended ranges read it
+    # last; with no overlapping partition it still yields correctly shaped results.
+    if start_year is None or end_year is None or not paths:
+        paths.append(DB_PATH)
+    return paths
+
+
+def _read_frames(
+    query: str, params: List[str], start_date: Optional[str], end_date: Optional[str], **kwargs
+) -> List[pd.DataFrame]:
+    frames = []
+    for path in _sources(start_date, end_date):
+        with get_connection(path) as conn:
+            frames.append(pd.read_sql_query(query, conn, params=params, **kwargs))
+    return frames
+
+
 def fetch_transactions_df(
     start_date: Optional[str] = None, end_date: Optional[str] = None, txn_type: Optional[str] = None
 ) -> pd.DataFrame:
@@ -108,9 +510,11 @@ def fetch_transactions_df(
         params.append(txn_type)
 
     query = f"SELECT * FROM transactions{where} ORDER BY date DESC, id DESC"
-    with get_connection() as conn:
-        df = pd.read_sql_query(query, conn, params=params, parse_dates=["date", "created_at"])
-    return df
+    frames = _read_frames(query, params, start_date, end_date, parse_dates=["date", "created_at"])
+    if len(frames) == 1:
+        return frames[0]
+    # Partitions come back oldest year first; reversing keeps the newest-first ordering.
+    return pd.concat(frames[::-1], ignore_index=True)
 
 
 def get_totals(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, float]:
@@ -121,10 +525,9 @@ def get_totals(start_date: Optional[str] = None, end_date: Optional[str] = None)
             SUM(CASE WHEN type='EXPENSE' THEN amount ELSE 0 END) AS expenses
         FROM transactions{where}
     """
-    with get_connection() as conn:
-        row = conn.execute(query, params).fetchone()
-    income = row["income"] or 0.0
-    expenses = row["expenses"] or 0.0
+    combined = pd.concat(_read_frames(query, params, start_date, end_date), ignore_index=True)
+    income = float(combined["income"].sum())
+    expenses = float(combined["expenses"].sum())
     net = income - expenses
     margin = (net / income * 100) if income else 0.0
     return {"income": income, "expenses": expenses, "net": net, "margin": margin}
@@ -140,9 +543,11 @@ def get_monthly_totals(start_date: Optional[str] = None, end_date: Optional[str]
         GROUP BY month
         ORDER BY month
     """
-    with get_connection() as conn:
-        df = pd.read_sql_query(query, conn, params=params)
-    return df
+    frames = _read_frames(query, params, start_date, end_date)
+    if len(frames) == 1:
+        return frames[0]
+    # Months never span partitions, so concatenating in year order keeps the result sorted.
+    return pd.concat(frames, ignore_index=True)
 
 
 def get_breakdown(
@@ -162,20 +567,44 @@ def get_breakdown(
         GROUP BY {group_by}
         ORDER BY total DESC
     """
-    with get_connection() as conn:
-        df = pd.read_sql_query(query, conn, params=params)
-    return df
+    frames = _read_frames(query, params, start_date, end_date)
+    if len(frames) == 1:
+        return frames[0]
+    combined = pd.concat(frames, ignore_index=True)
+    return (
+        combined.groupby("label", dropna=False, sort=False)["total"]
+        .sum()
+        .reset_index()
+        .sort_values("total", ascending=False, ignore_index=True)
+    )
 
 
 def get_date_bounds() -> Tuple[Optional[str], Optional[str]]:
     query = "SELECT MIN(date) as min_date, MAX(date) as max_date FROM transactions"
-    with get_connection() as conn:
-        row = conn.execute(query).fetchone()
-    min_date = row["min_date"]
-    max_date = row["max_date"]
+    min_date: Optional[str] = None
+    max_date: Optional[str] = None
+    for path in _sources(None, None):
+        with get_connection(path) as conn:
+            row = conn.execute(query).fetchone()
+        if row["min_date"] is not None and (min_date is None or row["min_date"] < min_date):
+            min_date = row["min_date"]
+        if row["max_date"] is not None and (max_date is None or row["max_date"] > max_date):
+            max_date = row["max_date"]
     return min_date, max_date
 
 
+def get_anomalies(start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+    where, params = _date_filters(start_date, end_date)
+    query = f"""
+        SELECT date, type, category, description, amount, reason, score, source_file
+        FROM anomalies{where}
+        ORDER BY date DESC, id DESC
+    """
+    with get_connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params, parse_dates=["date"])
+    return df
+
+
 def recent_files(limit: int = 10) -> List[sqlite3.Row]:
     with get_connection() as conn:
         rows = conn.execute(
@@ -184,9 +613,56 @@ def recent_files(limit: int = 10) -> List[sqlite3.Row]:
     return rows
 
 
+def vacuum(year: Optional[int] = None) -> None:
+    path = partition_path(year) if year is not None else DB_PATH
+    if not path.exists():
+        raise FileNotFoundError(f"No database found at {path}")
+    with get_connection(path) as conn:
+        conn.execute("VACUUM")
+
+
+def archive_partition(year: int, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    source = partition_path(year)
+    if not source.exists():
+        raise FileNotFoundError(f"No partition found for {year}")
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / source.name
+    shutil.move(str(source), target)
+    return target
+
+
+def restore_partition(year: int, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    target = partition_path(year)
+    source = archive_dir / target.name
+    if not source.exists():
+        raise FileNotFoundError(f"No archived partition found for {year}")
+    if not target.exists():
+        shutil.move(str(source), target)
+        return target
+
+    # Rows inserted while the year was archived went to a fresh partition: merge the archive into it.
+    # Copy and delete commit together, so an interrupted restore can simply be run again.
+    with get_connection(target) as conn:
+        conn.execute(_TRANSACTIONS_DDL.format(schema=""))
+        conn.execute("ATTACH DATABASE ? AS archived", (str(source),))
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            f"INSERT INTO main.transactions ({_TRANSACTION_COLUMNS}) "
+            f"SELECT {_TRANSACTION_COLUMNS} FROM archived.transactions ORDER BY id"
+        )
+        conn.execute("DELETE FROM archived.transactions")
+        conn.commit()
+        conn.execute("DETACH DATABASE archived")
+    source.unlink()
+    return target
+
+
 def clear_all() -> None:
     with get_connection() as conn:
         conn.execute("DELETE FROM transactions")
         conn.execute("DELETE FROM processed_files")
+        conn.execute("DELETE FROM category_stats")
+        conn.execute("DELETE FROM anomalies")
         conn.commit()
-
+    for year in list_partitions():
+        partition_path(year).unlink()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+STAT_KEYS = ["type", "category"]
+STAT_COLUMNS = STAT_KEYS + ["count", "mean", "m2"]
+DUPLICATE_KEYS = ["date", "type", "amount", "description"]
+
+Z_THRESHOLD = 3.5
+ROBUST_THRESHOLD = 3.5
+# Groups with less history than this are judged against the batch itself (median/MAD).
+MIN_HISTORY = 10
+ROBUST_MIN_ROWS = 5
+# Spread floor so constant categories (rent, salaries) are still scored: 5% of the typical amount,
+# and never below one euro.
+RELATIVE_FLOOR = 0.05
+ABSOLUTE_FLOOR = 1.0
+
+
+def _keyed(df: pd.DataFrame) -> pd.DataFrame:
+    keyed = df.copy()
+    keyed["category"] = keyed["category"].fillna("").astype(str)
+    keyed["amount"] = keyed["amount"].astype(float)
+    return keyed
+
+
+def _typed_stats(stats: pd.DataFrame) -> pd.DataFrame:
+    return stats.astype({"type": str, "category": str, "count": float, "mean": float, "m2": float})
+
+
+def empty_stats() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"type": pd.Series(dtype=str), "category": pd.Series(dtype=str), "count": pd.Series(dtype=int),
+         "mean": pd.Series(dtype=float), "m2": pd.Series(dtype=float)}
+    )
+
+
+def batch_stats(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return empty_stats()
+    keyed = _keyed(df)
+    grouped = keyed.groupby(STAT_KEYS)["amount"]
+    deviation = keyed["amount"] - grouped.transform("mean")
+    stats = grouped.agg(count="count", mean="mean")
+    stats["m2"] = (deviation**2).groupby([keyed["type"], keyed["category"]]).sum()
+    return stats.reset_index()[STAT_COLUMNS]
+
+
+def merge_stats(prior: pd.DataFrame, batch: pd.DataFrame) -> pd.DataFrame:
+    # Chan et al. pairwise form of Welford's update: combines two (count, mean, M2) summaries exactly.
+    merged = _typed_stats(prior).merge(_typed_stats(batch), on=STAT_KEYS, how="outer", suffixes=("_a", "_b"))
+    n_a = merged["count_a"].fillna(0)
+    n_b = merged["count_b"].fillna(0)
+    mean_a = merged["mean_a"].fillna(0.0)
+    mean_b = merged["mean_b"].fillna(0.0)
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    merged["count"] = n.astype(int)
+    merged["mean"] = mean_a + delta * n_b / n
+    merged["m2"] = merged["m2_a"].fillna(0.0) + merged["m2_b"].fillna(0.0) + delta**2 * n_a * n_b / n
+    return merged[STAT_COLUMNS]
+
+
+def _spread_floor(center: pd.Series) -> pd.Series:
+    return np.maximum(RELATIVE_FLOOR * center.abs(), ABSOLUTE_FLOOR)
+
+
+def flag_anomalies(df: pd.DataFrame, prior: pd.DataFrame, history: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    if df.empty:
+        return df.assign(reason=pd.Series(dtype=str), score=pd.Series(dtype=float))
+
+    keyed = _keyed(df).reset_index(drop=True)
+    scored = keyed.merge(_typed_stats(prior), on=STAT_KEYS, how="left")
+    count = scored["count"].fillna(0)
+    std = np.sqrt(scored["m2"] / (count - 1).where(count > 1))
+    z_score = (scored["amount"] - scored["mean"]) / np.maximum(std, _spread_floor(scored["mean"]))
+    has_history = count >= MIN_HISTORY
+
+    grouped = keyed.groupby(STAT_KEYS)["amount"]
+    median = grouped.transform("median")
+    mad = (keyed["amount"] - median).abs().groupby([keyed["type"], keyed["category"]]).transform("median")
+    robust_score = 0.6745 * (keyed["amount"] - median) / np.maximum(mad, _spread_floor(median))
+    robust_ok = ~has_history & (grouped.transform("count") >= ROBUST_MIN_ROWS)
+
+    score = z_score.where(has_history, robust_score.where(robust_ok))
+    outlier = score.abs() > np.where(has_history, Z_THRESHOLD, ROBUST_THRESHOLD)
+
+    # Duplicate checks only apply to described expenses (supplier invoices); identical sales are normal.
+    description = keyed["description"].fillna("").astype(str).str.strip()
+    candidates = (keyed["type"] == "EXPENSE") & (description != "")
+    duplicate = candidates & keyed.duplicated(subset=DUPLICATE_KEYS, keep="first")
+    if history is not None and not history.empty:
+        seen = pd.MultiIndex.from_frame(history[DUPLICATE_KEYS].astype({"amount": float}))
+        duplicate |= candidates & pd.MultiIndex.from_frame(keyed[DUPLICATE_KEYS]).isin(seen)
+
+    flagged = keyed.assign(
+        category=df["category"].reset_index(drop=True),
+        reason=np.where(duplicate, "duplicate", "outlier"),
+        score=score,
+    )
+    return flagged[outlier | duplicate].reset_index(drop=True)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import database as db
+
+
+def _row(date: str, amount: float = 10.0, type: str = "INCOME", category: str = "Ramos", description: str = "") -> dict:
+    return {
+        "date": date,
+        "amount": amount,
+        "type": type,
+        "category": category,
+        "subcategory": category,
+        "description": description,
+        "source_file": "test.xlsx",
+        "created_at": "2025-01-01T00:00:00",
+    }
+
+
+@pytest.fixture
+def row():
+    return _row
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.delenv(db.PARTITION_ENV, raising=False)
+    db.use_database(tmp_path / "sempreviva.db")
+    db.init_db()
+    yield db
+    db.use_database(Path("sempreviva.db"))
+
+
+@pytest.fixture
+def partitioned(tmp_path, monkeypatch):
+    monkeypatch.setenv(db.PARTITION_ENV, "1")
+    db.use_database(tmp_path / "sempreviva.db")
+    db.init_db()
+    yield db
+    db.use_database(Path("sempreviva.db"))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processing import anomalies
+
+
+def _frame(amounts, type="EXPENSE", category="Materiales", date="2025-03-01", description=""):
+    return pd.DataFrame(
+        {
+            "date": date,
+            "amount": amounts,
+            "type": type,
+            "category": category,
+            "description": description,
+            "source_file": "test.xlsx",
+        }
+    )
+
+
+def test_merge_stats_matches_direct_recomputation():
+    rng = np.random.default_rng(0)
+    first = pd.concat([_frame(rng.normal(50, 5, 40)), _frame(rng.normal(900, 30, 25), category="Alquiler")])
+    second = pd.concat([_frame(rng.normal(55, 8, 70)), _frame(rng.normal(20, 2, 15), type="INCOME", category="Ramos")])
+
+    merged = anomalies.merge_stats(anomalies.batch_stats(first), anomalies.batch_stats(second))
+    direct = anomalies.batch_stats(pd.concat([first, second]))
+
+    merged = merged.sort_values(anomalies.STAT_KEYS, ignore_index=True)
+    direct = direct.sort_values(anomalies.STAT_KEYS, ignore_index=True)
+    assert merged["count"].tolist() == direct["count"].tolist()
+    np.testing.assert_allclose(merged["mean"], direct["mean"])
+    np.testing.assert_allclose(merged["m2"], direct["m2"])
+
+
+def test_merge_stats_into_empty_prior_keeps_batch():
+    batch = anomalies.batch_stats(_frame([10.0, 12.0, 14.0]))
+    merged = anomalies.merge_stats(anomalies.empty_stats(), batch)
+    assert merged["count"].tolist() == [3]
+    assert merged["mean"].tolist() == pytest.approx([12.0])
+    assert merged["m2"].tolist() == pytest.approx([8.0])
+
+
+def test_flags_outlier_against_history():
+    prior = anomalies.batch_stats(_frame(np.linspace(45, 55, 30)))
+    flagged = anomalies.flag_anomalies(_frame([50.0, 51.0, 400.0]), prior)
+    assert flagged["amount"].tolist() == [400.0]
+    assert flagged["reason"].tolist() == ["outlier"]
+
+
+def test_flags_change_in_constant_category():
+    prior = anomalies.batch_stats(_frame([950.0] * 12, category="Alquiler"))
+    flagged = anomalies.flag_anomalies(_frame([950.0, 1900.0], category="Alquiler"), prior)
+    assert flagged["amount"].tolist() == [1900.0]
+
+
+def test_short_history_uses_batch_median():
+    batch = _frame([20.0, 21.0, 19.0, 20.5, 19.5, 500.0])
+    flagged = anomalies.flag_anomalies(batch, anomalies.empty_stats())
+    assert flagged["amount"].tolist() == [500.0]
+
+
+def test_duplicates_only_for_described_expenses():
+    batch = pd.concat(
+        [
+            _frame([120.0, 120.0], description="Factura 77"),
+            _frame([15.0, 15.0], type="INCOME", category="Ramos"),
+            _frame([30.0, 30.0]),
+        ]
+    )
+    flagged = anomalies.flag_anomalies(batch, anomalies.empty_stats())
+    assert flagged[["amount", "reason"]].values.tolist() == [[120.0, "duplicate"]]
+
+
+def test_duplicate_against_history():
+    history = _frame([120.0], description="Factura 77")[anomalies.DUPLICATE_KEYS]
+    flagged = anomalies.flag_anomalies(_frame([120.0], description="Factura 77"), anomalies.empty_stats(), history)
+    assert flagged["reason"].tolist() == ["duplicate"]
+
+
+def test_insert_flags_invoice_already_stored(database, row):
+    invoice = row("2025-05-01", 120.0, "EXPENSE", "Flores y verdes", "Factura 77")
+    database.insert_transactions([invoice])
+    database.insert_transactions([invoice])
+    assert database.get_anomalies()["reason"].tolist() == ["duplicate"]
+
+
+def test_concurrent_inserts_see_each_other(database, row):
+    invoice = row("2025-05-01", 120.0, "EXPENSE", "Flores y verdes", "Factura 77")
+    barrier = threading.Barrier(2)
+
+    def upload():
+        barrier.wait()
+        database.insert_transactions([invoice])
+
+    threads = [threading.Thread(target=upload) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert database.get_anomalies()["reason"].tolist() == ["duplicate"]
+
+
+def test_stats_track_inserted_rows(database, row):
+    database.insert_transactions([row("2025-01-01", amount) for amount in (10.0, 20.0, 30.0)])
+    database.insert_transactions([row("2025-02-01", 40.0)])
+    with database.get_connection() as conn:
+        stats = conn.execute("SELECT count, mean, m2 FROM category_stats").fetchone()
+    assert stats["count"] == 4
+    assert stats["mean"] == pytest.approx(25.0)
+    assert stats["m2"] == pytest.approx(500.0)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+import database as db
+
+
+def _indexes(path) -> list:
+    with sqlite3.connect(path) as conn:
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions'"
+        return [row[0] for row in conn.execute(query)]
+
+
+@pytest.mark.parametrize("mode", ["database", "partitioned"])
+def test_failed_load_rolls_back_rows_and_file_record(request, row, mode):
+    request.getfixturevalue(mode)
+    rows = [row("2024-01-01"), row("2025-01-01"), row("2025-02-01", type="REFUND")]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.bulk_load_transactions(rows, "broken.xlsx")
+    assert db.fetch_transactions_df().empty
+    assert db.recent_files() == []
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM category_stats").fetchone()[0] == 0
+
+
+@pytest.mark.parametrize("mode", ["database", "partitioned"])
+def test_empty_load_is_recorded(request, mode):
+    request.getfixturevalue(mode)
+    assert db.bulk_load_transactions([], "empty.xlsx")["rows"] == 0
+    assert [(f["filename"], f["row_count"]) for f in db.recent_files()] == [("empty.xlsx", 0)]
+
+
+def test_load_spanning_many_years_falls_back(partitioned, row):
+    rows = [row(f"{year}-06-01") for year in range(2000, 2000 + db._MAX_ATTACHED + 2)] + [row("NaT")]
+    assert db.bulk_load_transactions(rows, "wide.xlsx")["rows"] == len(rows)
+    assert len(db.fetch_transactions_df()) == len(rows)
+    assert db.recent_files()[0]["row_count"] == len(rows)
+
+
+@pytest.mark.parametrize("defer", [False, True])
+def test_load_detects_duplicates_and_keeps_index(database, row, defer):
+    invoice = row("2025-05-01", 120.0, "EXPENSE", "Flores y verdes", "Factura 77")
+    db.bulk_load_transactions([invoice], "first.xlsx")
+    db.bulk_load_transactions([invoice, row("2025-05-02")], "second.xlsx", defer_maintenance=defer)
+    assert db.get_anomalies()["reason"].tolist() == ["duplicate"]
+    assert "idx_transactions_date_amount" in _indexes(db.DB_PATH)
+
+
+def test_index_rebuilt_only_when_load_outweighs_stored_rows(database, row, monkeypatch):
+    monkeypatch.setattr(db, "BULK_DEFER_THRESHOLD", 3)
+    db.insert_transactions([row("2025-01-01")] * 4)
+    with db.get_connection() as conn:
+        assert not db._rebuild_index(conn, "main", 2, None)
+        assert not db._rebuild_index(conn, "main", 3, None)
+        assert db._rebuild_index(conn, "main", 4, None)
+        assert db._rebuild_index(conn, "main", 1, True)
+        assert not db._rebuild_index(conn, "main", 10, False)
+
+
+def test_relaxed_durability_is_restored(partitioned, row, monkeypatch):
+    levels = {}
+    get_connection = db.get_connection
+
+    @contextmanager
+    def tracked(path=None):
+        # synchronous is per connection, so it is read on the load's own connection before it closes.
+        with get_connection(path) as conn:
+            yield conn
+            for schema in ("main", "p2025"):
+                levels[schema] = conn.execute(f"PRAGMA {schema}.synchronous").fetchone()[0]
+
+    monkeypatch.setattr(db, "get_connection", tracked)
+    db.bulk_load_transactions([row("2025-01-01"), row("NaT")], "relaxed.xlsx", relax_durability=True)
+    assert levels == {"main": 2, "p2025": 2}
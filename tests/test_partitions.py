@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sqlite3
+from multiprocessing.pool import ThreadPool
+
+import pytest
+
+import database as db
+
+
+def _count(path) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+
+def test_inserts_are_routed_by_year(partitioned, row):
+    partitioned.insert_transactions([row("2023-05-01"), row("2024-01-01"), row("2024-12-31"), row("NaT")])
+    assert partitioned.list_partitions() == [2023, 2024]
+    assert _count(partitioned.partition_path(2023)) == 1
+    assert _count(partitioned.partition_path(2024)) == 2
+    assert _count(partitioned.DB_PATH) == 1
+
+
+def test_loads_spanning_more_years_than_attachable(partitioned, row):
+    rows = [row(f"{year}-06-01") for year in range(2000, 2000 + db._MAX_ATTACHED + 3)]
+    assert partitioned.insert_transactions(rows) == len(rows)
+    assert len(partitioned.list_partitions()) == len(rows)
+
+
+def test_date_filters_only_open_overlapping_partitions(partitioned, row):
+    partitioned.insert_transactions([row(f"{year}-06-01") for year in (2022, 2023, 2024)])
+    assert partitioned._sources("2023-01-01", "2023-12-31") == [partitioned.partition_path(2023)]
+    assert partitioned._sources("2023-01-01", "2024-03-01") == [
+        partitioned.partition_path(2023),
+        partitioned.partition_path(2024),
+    ]
+    assert partitioned._sources("2030-01-01", "2030-12-31") == [partitioned.DB_PATH]
+    assert partitioned._sources(None, "2022-12-31") == [partitioned.partition_path(2022), partitioned.DB_PATH]
+
+
+@pytest.mark.parametrize("mode", ["database", "partitioned"])
+def test_queries_match_unpartitioned_results(request, row, mode):
+    request.getfixturevalue(mode)
+    db.insert_transactions(
+        [
+            row("2023-11-30", 100.0),
+            row("2024-01-15", 50.0, "EXPENSE", "Materiales"),
+            row("2024-02-01", 25.0),
+            row("NaT", 5.0),
+        ]
+    )
+
+    assert db.get_date_bounds() == ("2023-11-30", "NaT")
+    assert db.get_totals()["income"] == 130.0
+    assert db.get_totals("2024-01-01", "2024-12-31") == {"income": 25.0, "expenses": 50.0, "net": -25.0, "margin": -100.0}
+    assert db.get_monthly_totals()["month"].tolist() == ["2023-11", "2024-01", "2024-02", "NaT"]
+    assert db.get_breakdown("INCOME", start_date="2023-01-01", end_date="2024-12-31")["total"].tolist() == [125.0]
+    assert len(db.fetch_transactions_df()) == 4
+    assert db.fetch_transactions_df("2024-01-01", "2024-12-31")["amount"].tolist() == [25.0, 50.0]
+
+
+def test_migration_moves_rows_once(database, monkeypatch, row):
+    db.insert_transactions([row(f"{year}-01-01") for year in range(2010, 2022)] + [row("NaT")])
+
+    with pytest.raises(RuntimeError):
+        db.migrate_to_partitions()
+    assert _count(db.DB_PATH) == 13
+
+    monkeypatch.setenv(db.PARTITION_ENV, "1")
+    with ThreadPool(3) as pool:
+        moved = pool.map(lambda _: db.migrate_to_partitions(), range(3))
+    assert sum(moved) == 12
+    assert sum(_count(db.partition_path(year)) for year in db.list_partitions()) == 12
+    assert _count(db.DB_PATH) == 1
+
+
+def test_restore_merges_rows_added_while_archived(partitioned, row, tmp_path):
+    archive_dir = tmp_path / "archive"
+    partitioned.insert_transactions([row("2019-01-01"), row("2019-02-01")])
+    partitioned.archive_partition(2019, archive_dir)
+    assert partitioned.fetch_transactions_df().empty
+
+    partitioned.insert_transactions([row("2019-03-01")])
+    partitioned.restore_partition(2019, archive_dir)
+    assert _count(partitioned.partition_path(2019)) == 3
+    assert not list(archive_dir.iterdir())
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import database as db
+
+CATEGORIES = {
+    "INCOME": ["Ramos", "Eventos", "Plantas", "Suscripciones"],
+    "EXPENSE": ["Flores y verdes", "Alquiler del local", "Materiales", "Transporte y envíos", "Servicios"],
+}
+
+# (role, latency in seconds, outcome, error message) where outcome is "ok", "locked" or "error".
+Sample = Tuple[str, float, str, Optional[str]]
+
+
+def _load_app():
+    # Silences the "No runtime found" cache warnings of running app outside `streamlit run`.
+    from streamlit import logger
+
+    logger.set_log_level("error")
+    return importlib.import_module("app")
+
+
+def _random_rows(rng: random.Random, count: int, first_day: date, days: int, source: str) -> List[Dict]:
+    rows = []
+    for _ in range(count):
+        txn_type = "INCOME" if rng.random() < 0.6 else "EXPENSE"
+        category = rng.choice(CATEGORIES[txn_type])
+        rows.append(
+            {
+                "date": (first_day + timedelta(days=rng.randrange(days))).isoformat(),
+                "amount": round(rng.lognormvariate(3.5, 0.8), 2),
+                "type": txn_type,
+                "category": category,
+                "subcategory": category,
+                "description": f"{category} #{rng.randrange(10**6)}",
+                "source_file": source,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        )
+    return rows
+
+
+def _outcome(exc: Exception) -> str:
+    if isinstance(exc, sqlite3.OperationalError) and "database is locked" in str(exc):
+        return "locked"
+    return "error"
+
+
+def _reader(worker: int, deadline: float, first_day: date, days: int, seed: int) -> List[Sample]:
+    app = _load_app()
+    rng = random.Random(seed + worker)
+    samples: List[Sample] = []
+    while time.time() < deadline:
+        start = first_day + timedelta(days=rng.randrange(days))
+        end = start + timedelta(days=rng.randrange(1, days))
+        began = time.perf_counter()
+        try:
+            app._load_datasets(start.isoformat(), end.isoformat())
+            outcome, message = "ok", None
+        except Exception as exc:  # noqa: BLE001 - every failure is counted, not raised
+            outcome, message = _outcome(exc), f"{type(exc).__name__}: {exc}"
+        samples.append(("read", time.perf_counter() - began, outcome, message))
+    return samples
+
+
+def _writer(
+    worker: int, deadline: float, first_day: date, days: int, seed: int, batch_size: int, bulk: bool
+) -> List[Sample]:
+    rng = random.Random(seed + 10_000 + worker)
+    samples: List[Sample] = []
+    batch = 0
+    while time.time() < deadline:
+        filename = f"loadtest-{worker}-{batch}.xlsx"
+        rows = _random_rows(rng, batch_size, first_day, days, filename)
+        began = time.perf_counter()
+        try:
+            if bulk:
+                db.bulk_load_transactions(rows, filename)
+            else:
+                inserted = db.insert_transactions(rows)
+                db.record_processed_file(filename, inserted)
+            outcome, message = "ok", None
+        except Exception as exc:  # noqa: BLE001 - every failure is counted, not raised
+            outcome, message = _outcome(exc), f"{type(exc).__name__}: {exc}"
+        samples.append(("write", time.perf_counter() - began, outcome, message))
+        batch += 1
+    return samples
+
+
+def _process_reader(path: str, *args) -> List[Sample]:
+    db.use_database(path)
+    return _reader(*args)
+
+
+def _process_writer(path: str, *args) -> List[Sample]:
+    db.use_database(path)
+    return _writer(*args)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: List[Sample], elapsed: float, batch_size: int) -> Dict[str, Dict]:
+    report: Dict[str, Dict] = {}
+    for role in ("read", "write"):
+        role_samples = [sample for sample in samples if sample[0] == role]
+        latencies = sorted(latency * 1000 for _, latency, outcome, _ in role_samples if outcome == "ok")
+        errors = [message for _, _, outcome, message in role_samples if outcome == "error"]
+        ok = len(latencies)
+        report[role] = {
+            "operations": len(role_samples),
+            "ok": ok,
+            "locked": sum(1 for sample in role_samples if sample[2] == "locked"),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+            "throughput_per_s": ok / elapsed if elapsed else 0.0,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+        }
+    report["write"]["rows_per_s"] = report["write"]["throughput_per_s"] * batch_size
+    return report
+
+
+def _print_report(report: Dict[str, Dict], elapsed: float) -> None:
+    print(f"Duración: {elapsed:.1f} s")
+    header = f"{'rol':<6}{'ops':>8}{'ok':>8}{'locked':>8}{'errores':>9}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    for role, stats in report.items():
+        print(
+            f"{role:<6}{stats['operations']:>8}{stats['ok']:>8}{stats['locked']:>8}{stats['errors']:>9}"
+            f"{stats['throughput_per_s']:>9.1f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+        )
+    print(f"Filas escritas/s: {report['write']['rows_per_s']:.0f}")
+    for role, stats in report.items():
+        if stats["first_error"]:
+            print(f"Primer error ({role}): {stats['first_error']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Simula sesiones concurrentes del dashboard contra SQLite, sin navegador ni red."
+    )
+    parser.add_argument("--readers", type=int, default=8, help="Sesiones que llaman a app._load_datasets")
+    parser.add_argument("--writers", type=int, default=2, help="Procesos de subida que insertan transacciones")
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos de carga")
+    parser.add_argument("--batch-size", type=int, default=500, help="Filas por subida simulada")
+    parser.add_argument("--seed-rows", type=int, default=20_000, help="Filas iniciales antes de medir")
+    parser.add_argument("--years", type=int, default=3, help="Años de historia simulada")
+    parser.add_argument("--bulk", action="store_true", help="Los escritores usan bulk_load_transactions")
+    parser.add_argument("--processes", action="store_true", help="Usa procesos en lugar de hilos")
+    parser.add_argument("--db", type=Path, help="Base de datos a usar (por defecto, una temporal)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Imprime el informe en JSON")
+    parser.add_argument("--fail-on-locked", action="store_true", help="Sale con código 1 si hay errores de bloqueo")
+    args = parser.parse_args()
+
+    temp_dir = None if args.db else tempfile.mkdtemp(prefix="sempreviva-load-")
+    path = str(args.db or Path(temp_dir) / "sempreviva.db")
+    try:
+        return _run(args, path)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _run(args: argparse.Namespace, path: str) -> int:
+    # Must run before app is imported: importing it bootstraps the configured database.
+    db.use_database(path)
+    _load_app()
+
+    first_day = date(date.today().year - args.years + 1, 1, 1)
+    days = (date.today() - first_day).days + 1
+    rng = random.Random(args.seed)
+    if args.seed_rows:
+        db.insert_transactions(_random_rows(rng, args.seed_rows, first_day, days, "seed.xlsx"))
+
+    deadline = time.time() + args.duration
+    executor_cls = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+    reader, writer = (_process_reader, _process_writer) if args.processes else (_reader, _writer)
+    prefix = (path,) if args.processes else ()
+    began = time.perf_counter()
+    with executor_cls(max_workers=args.readers + args.writers) as pool:
+        futures = [
+            pool.submit(reader, *prefix, worker, deadline, first_day, days, args.seed)
+            for worker in range(args.readers)
+        ]
+        futures += [
+            pool.submit(writer, *prefix, worker, deadline, first_day, days, args.seed, args.batch_size, args.bulk)
+            for worker in range(args.writers)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - began
+
+    report = summarize(samples, elapsed, args.batch_size)
+    if args.json:
+        print(json.dumps({"database": path, "elapsed_s": elapsed, **report}, indent=2))
+    else:
+        print(f"Base de datos: {path}")
+        _print_report(report, elapsed)
+
+    locked = report["read"]["locked"] + report["write"]["locked"]
+    return 1 if args.fail_on_locked and locked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
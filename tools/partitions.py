@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+import database as db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gestiona las particiones anuales de sempreviva.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Lista las particiones activas")
+    sub.add_parser("migrate", help="Mueve las filas de la tabla principal a particiones anuales")
+    vacuum = sub.add_parser("vacuum", help="Compacta una partición (o la base principal si no se indica año)")
+    vacuum.add_argument("year", type=int, nargs="?")
+    for name, help_text in (("archive", "Saca una partición del conjunto consultado"), ("restore", "Reactiva una partición archivada")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("year", type=int)
+        cmd.add_argument("--archive-dir", type=Path, default=db.ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    load_dotenv()
+    if args.command == "list":
+        for year in db.list_partitions():
+            path = db.partition_path(year)
+            print(f"{year}\t{path}\t{path.stat().st_size / 1024:.0f} KiB")
+    elif args.command == "migrate":
+        if not db.partitioning_enabled():
+            parser.error(f"define {db.PARTITION_ENV}=1 antes de migrar; si no, las filas se borrarían.")
+        db.init_db()
+        print(f"{db.migrate_to_partitions()} filas movidas a particiones.")
+    elif args.command == "vacuum":
+        db.vacuum(args.year)
+        print(f"Compactada {db.partition_path(args.year) if args.year else db.DB_PATH}.")
+    elif args.command == "archive":
+        print(f"Archivada en {db.archive_partition(args.year, args.archive_dir)}.")
+    else:
+        print(f"Restaurada en {db.restore_partition(args.year, args.archive_dir)}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,23 @@ import streamlit as st
 
 from utils import charts
 
+TYPE_LABELS = {"INCOME": "Ingreso", "EXPENSE": "Gasto"}
+REASON_LABELS = {"outlier": "Importe atípico", "duplicate": "Posible duplicado"}
+ANOMALY_COLUMNS = {
+    "date": "Fecha",
+    "type": "Tipo",
+    "category": "Categoría",
+    "description": "Descripción",
+    "amount": "Importe",
+    "reason": "Motivo",
+    "score": "Puntuación",
+    "source_file": "Archivo",
+}
 
-def render_dashboard(totals, trend_df, income_breakdown_df, expense_breakdown_df, ai_text: str | None = None):
+
+def render_dashboard(
+    totals, trend_df, income_breakdown_df, expense_breakdown_df, ai_text: str | None = None, anomalies_df=None
+):
     st.header("Panel general")
 
     if ai_text:
@@ -40,3 +55,11 @@ def render_dashboard(totals, trend_df, income_breakdown_df, expense_breakdown_df
         else:
             st.caption("No hay gastos registrados en el periodo.")
 
+    if anomalies_df is not None and not anomalies_df.empty:
+        st.subheader("Movimientos inusuales")
+        st.caption("Importes atípicos para su categoría o posibles facturas duplicadas detectados al subir los archivos.")
+        table = anomalies_df.assign(
+            type=anomalies_df["type"].map(TYPE_LABELS).fillna(anomalies_df["type"]),
+            reason=anomalies_df["reason"].map(REASON_LABELS).fillna(anomalies_df["reason"]),
+        ).rename(columns=ANOMALY_COLUMNS)
+        st.dataframe(table, use_container_width=True)
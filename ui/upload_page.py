@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import streamlit as st
 
-from database import insert_transactions, record_processed_file, recent_files
+from database import bulk_load_transactions, recent_files
 from processing import expenses, income
 
 
@@ -20,10 +20,10 @@ def render_upload_page():
             else:
                 df, rows = expenses.process_expenses(uploaded_file, uploaded_file.name)
 
-            inserted = insert_transactions(rows)
-            record_processed_file(uploaded_file.name, inserted)
+            result = bulk_load_transactions(rows, uploaded_file.name)
 
-            st.success(f"Procesado completado: {inserted} filas insertadas.")
+            st.success(f"Procesado completado: {result['rows']} filas insertadas.")
+            st.caption(f"{result['rows_per_s']:.0f} filas/s en {result['seconds']:.2f} s")
             st.dataframe(df.head())
         except Exception as exc:
             st.error(f"No se pudo procesar el archivo: {exc}")
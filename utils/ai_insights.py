@@ -4,26 +4,32 @@ import json
 import os
 from typing import Any, Dict, Optional
 
-import google.generativeai as genai
-from dotenv import load_dotenv
+from utils import timing
 
-load_dotenv()
+_genai = None
 
 
-def _configure() -> Optional[str]:
+def _configure():
+    # google.generativeai is slow to import, so it is only loaded once an API key is present.
+    global _genai
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         return None
-    genai.configure(api_key=api_key)
-    return api_key
+    if _genai is None:
+        with timing.timed("import google.generativeai", once=True):
+            import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        _genai = genai
+    return _genai
 
 
 def generate_insights(stats: Dict[str, Any]) -> Optional[str]:
     if not stats:
         return None
 
-    api_key = _configure()
-    if not api_key:
+    genai = _configure()
+    if genai is None:
         return None
 
     prompt = (
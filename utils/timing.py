@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# One-time costs (first imports, bootstrap) are shared by the whole process; everything else is
+# kept per script run, since Streamlit executes each session's reruns in its own thread.
+_STARTUP: Dict[str, float] = {}
+_run = threading.local()
+
+
+def _current() -> Dict[str, float]:
+    if not hasattr(_run, "timings"):
+        _run.timings = {}
+    return _run.timings
+
+
+def reset() -> None:
+    _run.timings = {}
+
+
+@contextmanager
+def timed(label: str, once: bool = False):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        if once:
+            _STARTUP.setdefault(label, elapsed)
+        else:
+            _current()[label] = elapsed
+
+
+def report() -> List[str]:
+    lines = [f"{label} (arranque): {elapsed:.1f} ms" for label, elapsed in _STARTUP.items()]
+    current = sorted(_current().items(), key=lambda item: -item[1])
+    return lines + [f"{label}: {elapsed:.1f} ms" for label, elapsed in current]